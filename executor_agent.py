@@ -4,7 +4,10 @@ class ExecutorAgent:
     def __init__(self, tools_layer):
         self.tools = tools_layer
 
-    def run(self, actions):
+    def run(self, actions, speculation=None):
         # re-use your existing execute_actions function in main.py
         from main import execute_actions
-        return execute_actions(actions)
+        from tools import use_speculation
+        # speculation: pre-resolved note ids from tools.prefetch_titles
+        with use_speculation(speculation):
+            return execute_actions(actions)
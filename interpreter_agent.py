@@ -88,6 +88,9 @@ class InterpreterAgent:
         return prompt
 
     def run(self, text: str) -> Optional[List[Dict[str, Any]]]:
+        return self.run_local(text) or self.run_llm(text)
+
+    def run_local(self, text: str) -> Optional[List[Dict[str, Any]]]:
         # 1) Try deterministic local parser first
         try:
             parsed = self.parser(text)
@@ -95,8 +98,10 @@ class InterpreterAgent:
                 return parsed
         except Exception:
             # if local parser crashes, fall through to LLM if enabled
-            parsed = None
+            pass
+        return None
 
+    def run_llm(self, text: str) -> Optional[List[Dict[str, Any]]]:
         # 2) If LLM disabled, return None
         if not self.enable_llm:
             return None
@@ -14,7 +14,8 @@ from pydantic import BaseModel
 from tools_layer import ToolsLayer
 from tools import (
     create_note, list_notes, update_note, delete_note,
-    add_checklist_item, check_checklist_item
+    add_checklist_item, check_checklist_item,
+    prefetch_titles
 )
 
 from supervisor_agent import SupervisorAgent
@@ -189,7 +190,7 @@ model = os.getenv("LLM_MODEL", "gpt-4o-mini")
 
 interpreter = InterpreterAgent(local_parse_multiple, enable_llm=enable_llm, model=model)
 executor = ExecutorAgent(ToolsLayer())
-supervisor = SupervisorAgent(interpreter, executor)
+supervisor = SupervisorAgent(interpreter, executor, prefetch_fn=prefetch_titles)
 
 
 # ======================================================
@@ -199,6 +200,14 @@ supervisor = SupervisorAgent(interpreter, executor)
 def health():
     return {"status": "Botzi Agent is running"}
 
+@app.on_event("shutdown")
+def shutdown():
+    supervisor.close()
+
+@app.get("/metrics")
+def metrics():
+    return supervisor.metrics
+
 @app.post("/chat")
 def chat(req: ChatRequest):
     responses = supervisor.handle(req.message)
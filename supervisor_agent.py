@@ -1,9 +1,28 @@
 # supervisor_agent.py
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Any, Optional
+
 
 class SupervisorAgent:
-    def __init__(self, interpreter, executor):
+    def __init__(self, interpreter, executor,
+                 prefetch_fn: Optional[Callable[[str], Optional[Dict[str, Any]]]] = None):
         self.interpreter = interpreter
         self.executor = executor
+        # prefetch_fn pre-resolves note titles while the LLM interprets
+        self.prefetch = prefetch_fn
+        self._pool = ThreadPoolExecutor(max_workers=4) if prefetch_fn else None
+        self._metrics_lock = threading.Lock()
+        self.metrics = {"speculation_used": 0, "speculation_wasted": 0}
+
+    def close(self):
+        if self._pool:
+            self._pool.shutdown(wait=False)
+
+    def _record_speculation(self, used: bool):
+        key = "speculation_used" if used else "speculation_wasted"
+        with self._metrics_lock:
+            self.metrics[key] += 1
 
     def handle(self, text: str):
         tl = text.lower().strip()
@@ -12,32 +31,54 @@ class SupervisorAgent:
         if tl in ("hi", "hello", "hey", "yo", "hii", "hiii"):
             return ["Hello! How can I help you today? 🙂"]
 
-        # Interpret (LLM + fallback)
-        actions = self.interpreter.run(text)
-
-        if not actions:
-            return [
-                "I couldn't understand that. Try:",
-                "• add note shopping",
-                "• update shopping content to 'buy eggs'",
-                "• show notes"
-            ]
-
-        # Basic validation: drop invalid actions
-        valid = []
-        for a in actions:
-            act = a.get("action")
-            if not act:
-                continue
-            # update/delete must have identifier
-            if act in ("update", "delete", "show_one", "pin", "unpin", "archive", "unarchive",
-                       "add_label", "remove_label", "add_check", "check_item") and not a.get("identifier"):
-                # skip invalid
-                continue
-            valid.append(a)
-
-        if not valid:
-            return ["Your request seems incomplete or unclear."]
-
-        # Execute actions and return results
-        return self.executor.run(valid)
+        # The local parser answers immediately, so there is nothing to overlap
+        # a prefetch with. Only speculate when we fall through to the LLM.
+        actions = self.interpreter.run_local(text)
+
+        speculation = None
+        if not actions and self._pool and self.interpreter.enable_llm:
+            speculation = self._pool.submit(self.prefetch, text)
+
+        spec = None
+        try:
+            # Interpret (LLM fallback)
+            if not actions:
+                actions = self.interpreter.run_llm(text)
+
+            if not actions:
+                return [
+                    "I couldn't understand that. Try:",
+                    "• add note shopping",
+                    "• update shopping content to 'buy eggs'",
+                    "• show notes"
+                ]
+
+            # Basic validation: drop invalid actions
+            valid = []
+            for a in actions:
+                act = a.get("action")
+                if not act:
+                    continue
+                # update/delete must have identifier
+                if act in ("update", "delete", "show_one", "pin", "unpin", "archive", "unarchive",
+                           "add_label", "remove_label", "add_check", "check_item") and not a.get("identifier"):
+                    # skip invalid
+                    continue
+                valid.append(a)
+
+            if not valid:
+                return ["Your request seems incomplete or unclear."]
+
+            # Hand the pre-resolved titles to execution
+            if speculation:
+                try:
+                    spec = speculation.result()
+                except Exception:
+                    spec = None
+
+            # Execute actions and return results
+            return self.executor.run(valid, speculation=spec)
+        finally:
+            # used only if a lookup was actually answered from the speculation
+            if speculation:
+                self._record_speculation(bool(spec and spec["hits"]))
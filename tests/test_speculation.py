@@ -0,0 +1,228 @@
+import pytest
+
+import tools
+from supervisor_agent import SupervisorAgent
+
+
+NOTES = [
+    {"id": "id-shopping", "title": "Shopping"},
+    {"id": "id-todo", "title": "todo"},
+]
+
+
+class FakeResponse:
+    def __init__(self, data):
+        self._data = data
+
+    def json(self):
+        return self._data
+
+
+class FakeRequests:
+    """Stands in for the requests module; records every call."""
+
+    def __init__(self, notes):
+        self.notes = notes
+        self.calls = []
+        self.on_get = None
+
+    def get(self, url, timeout=None):
+        self.calls.append(("get", url))
+        if self.on_get:
+            self.on_get()
+        return FakeResponse(self.notes)
+
+    def post(self, url, json=None, timeout=None):
+        self.calls.append(("post", url))
+        return FakeResponse({"id": "id-new", **json})
+
+    def delete(self, url, timeout=None):
+        self.calls.append(("delete", url))
+        return FakeResponse({})
+
+    def patch(self, url, json=None, timeout=None):
+        self.calls.append(("patch", url))
+        return FakeResponse(json)
+
+    def gets(self):
+        return [c for c in self.calls if c[0] == "get"]
+
+
+@pytest.fixture
+def fake_requests(monkeypatch):
+    fake = FakeRequests(list(NOTES))
+    monkeypatch.setattr(tools, "requests", fake)
+    return fake
+
+
+# -----------------------------
+# tools: prefetch + resolution
+# -----------------------------
+def test_prefetch_titles_resolves_titles_in_message(fake_requests):
+    spec = tools.prefetch_titles("please pin shopping")
+    assert spec["ids"] == {"shopping": "id-shopping"}
+    assert spec["hits"] == 0
+
+
+def test_prefetch_titles_returns_none_on_bad_backend(fake_requests):
+    fake_requests.notes = {"error": "boom"}
+    assert tools.prefetch_titles("pin shopping") is None
+
+
+def test_resolve_id_uses_speculation_without_fetching(fake_requests):
+    spec = tools.prefetch_titles("pin shopping")
+    fake_requests.calls.clear()
+    with tools.use_speculation(spec):
+        assert tools._resolve_id("shopping") == "id-shopping"
+    assert fake_requests.gets() == []
+    assert spec["hits"] == 1
+
+
+def test_resolve_id_falls_back_to_live_lookup_on_miss(fake_requests):
+    spec = tools.prefetch_titles("pin shopping")
+    fake_requests.calls.clear()
+    with tools.use_speculation(spec):
+        assert tools._resolve_id("todo") == "id-todo"
+    assert len(fake_requests.gets()) == 1
+    assert spec["hits"] == 0
+
+
+def test_speculation_only_applies_inside_its_request(fake_requests):
+    spec = tools.prefetch_titles("pin shopping")
+    fake_requests.calls.clear()
+    assert tools._resolve_id("shopping") == "id-shopping"
+    assert len(fake_requests.gets()) == 1
+    assert spec["hits"] == 0
+
+
+@pytest.mark.parametrize("mutate", [
+    lambda: tools.create_note("groceries"),
+    lambda: tools.delete_note("todo"),
+    lambda: tools.update_note("todo", {"title": "chores"}),
+])
+def test_speculation_discarded_after_mutation(fake_requests, mutate):
+    spec = tools.prefetch_titles("pin shopping")
+    with tools.use_speculation(spec):
+        mutate()
+        fake_requests.calls.clear()
+        tools._resolve_id("shopping")
+    assert len(fake_requests.gets()) == 1
+    assert spec["hits"] == 0
+
+
+def test_speculation_kept_after_non_title_update(fake_requests):
+    spec = tools.prefetch_titles("pin shopping and todo")
+    with tools.use_speculation(spec):
+        tools.update_note("todo", {"isPinned": True})
+        fake_requests.calls.clear()
+        assert tools._resolve_id("shopping") == "id-shopping"
+    assert fake_requests.gets() == []
+    assert spec["hits"] == 2
+
+
+def test_mutation_during_prefetch_invalidates_it(fake_requests):
+    # another request deletes a note while our GET is in flight
+    fake_requests.on_get = lambda: tools._bump_generation()
+    spec = tools.prefetch_titles("pin shopping")
+    fake_requests.on_get = None
+    with tools.use_speculation(spec):
+        fake_requests.calls.clear()
+        tools._resolve_id("shopping")
+    assert len(fake_requests.gets()) == 1
+    assert spec["hits"] == 0
+
+
+# -----------------------------
+# supervisor: when to speculate + metrics
+# -----------------------------
+class FakeInterpreter:
+    def __init__(self, local=None, llm=None, enable_llm=True):
+        self.local = local
+        self.llm = llm
+        self.enable_llm = enable_llm
+
+    def run_local(self, text):
+        return self.local
+
+    def run_llm(self, text):
+        if isinstance(self.llm, Exception):
+            raise self.llm
+        return self.llm
+
+
+class FakeExecutor:
+    """Resolves every identifier through the speculation like tools does."""
+
+    def __init__(self):
+        self.speculation = None
+
+    def run(self, actions, speculation=None):
+        self.speculation = speculation
+        with tools.use_speculation(speculation):
+            return [tools._speculative_id(a.get("identifier")) for a in actions]
+
+
+def make_supervisor(interpreter, prefetched):
+    calls = []
+
+    def prefetch(text):
+        calls.append(text)
+        return prefetched
+
+    sup = SupervisorAgent(interpreter, FakeExecutor(), prefetch_fn=prefetch)
+    return sup, calls
+
+
+def spec(ids):
+    return {"ids": ids, "generation": tools._current_generation(), "hits": 0}
+
+
+def test_local_parse_skips_speculation():
+    interp = FakeInterpreter(local=[{"action": "show_all"}])
+    sup, calls = make_supervisor(interp, spec({}))
+    sup.handle("show notes")
+    sup.close()
+    assert calls == []
+    assert sup.metrics == {"speculation_used": 0, "speculation_wasted": 0}
+
+
+def test_llm_disabled_skips_speculation():
+    interp = FakeInterpreter(enable_llm=False)
+    sup, calls = make_supervisor(interp, spec({}))
+    sup.handle("something odd")
+    sup.close()
+    assert calls == []
+
+
+def test_speculation_used_when_lookup_hits():
+    interp = FakeInterpreter(llm=[{"action": "delete", "identifier": "shopping"}])
+    sup, calls = make_supervisor(interp, spec({"shopping": "id-shopping"}))
+    assert sup.handle("get rid of shopping") == ["id-shopping"]
+    sup.close()
+    assert calls == ["get rid of shopping"]
+    assert sup.metrics == {"speculation_used": 1, "speculation_wasted": 0}
+
+
+def test_speculation_wasted_when_lookup_misses():
+    interp = FakeInterpreter(llm=[{"action": "delete", "identifier": "todo"}])
+    sup, _ = make_supervisor(interp, spec({"shopping": "id-shopping"}))
+    sup.handle("get rid of todo")
+    sup.close()
+    assert sup.metrics == {"speculation_used": 0, "speculation_wasted": 1}
+
+
+def test_speculation_wasted_when_not_understood():
+    interp = FakeInterpreter(llm=None)
+    sup, _ = make_supervisor(interp, spec({"shopping": "id-shopping"}))
+    sup.handle("gibberish shopping")
+    sup.close()
+    assert sup.metrics == {"speculation_used": 0, "speculation_wasted": 1}
+
+
+def test_speculation_counted_when_interpreter_raises():
+    interp = FakeInterpreter(llm=RuntimeError("llm down"))
+    sup, _ = make_supervisor(interp, spec({}))
+    with pytest.raises(RuntimeError):
+        sup.handle("pin shopping please")
+    sup.close()
+    assert sup.metrics == {"speculation_used": 0, "speculation_wasted": 1}
@@ -1,5 +1,7 @@
 # tools.py
 import os
+import threading
+from contextlib import contextmanager
 import requests
 from typing import Optional, Dict, Any, List
 
@@ -7,6 +9,14 @@ from typing import Optional, Dict, Any, List
 # can target local development backend (default) or a remote host.
 BASE_URL = os.getenv("AGENT_BASE_URL", "http://localhost:5000/api/notes")
 
+# Bumped after every create/delete/rename so a speculative title lookup
+# fetched before the change is never trusted afterwards.
+_notes_lock = threading.Lock()
+_notes_generation = 0
+
+# Speculative title -> id map for the request running on this thread.
+_speculation = threading.local()
+
 
 def safe_json(response):
     try:
@@ -22,6 +32,66 @@ def safe_json(response):
 # -----------------------------
 # Helpers
 # -----------------------------
+def _current_generation() -> int:
+    with _notes_lock:
+        return _notes_generation
+
+
+def _bump_generation():
+    global _notes_generation
+    with _notes_lock:
+        _notes_generation += 1
+
+
+def prefetch_titles(text: str) -> Optional[Dict[str, Any]]:
+    """
+    Fetch all notes and pre-resolve every note title that appears in `text`.
+    The result belongs to the request that made it: run execution inside
+    use_speculation(result) so _resolve_id can skip the title lookup.
+    Returns None if the backend couldn't be read.
+    """
+    generation = _current_generation()
+    try:
+        r = requests.get(BASE_URL, timeout=30)
+        notes = r.json()
+    except:
+        return None
+
+    if not isinstance(notes, list):
+        return None
+
+    tl = text.lower()
+    ids = {}
+    for n in notes:
+        title = (n.get("title") or "").lower()
+        # first match wins, same as _find_by_title
+        if title.strip() and title in tl and n.get("id") and title not in ids:
+            ids[title] = n["id"]
+    return {"ids": ids, "generation": generation, "hits": 0}
+
+
+@contextmanager
+def use_speculation(speculation: Optional[Dict[str, Any]]):
+    _speculation.current = speculation
+    try:
+        yield speculation
+    finally:
+        _speculation.current = None
+
+
+def _speculative_id(identifier: str) -> Optional[str]:
+    spec = getattr(_speculation, "current", None)
+    if not spec or not identifier:
+        return None
+    # a note was created, deleted or renamed since the prefetch
+    if spec["generation"] != _current_generation():
+        return None
+    nid = spec["ids"].get(identifier.lower())
+    if nid:
+        spec["hits"] += 1
+    return nid
+
+
 def _find_by_title(title: str) -> Optional[Dict[str, Any]]:
     r = requests.get(BASE_URL, timeout=30)
     try:
@@ -39,6 +109,10 @@ def _resolve_id(identifier: str) -> Optional[str]:
     if identifier and len(identifier) == 24 and identifier.isalnum():
         return identifier
 
+    nid = _speculative_id(identifier)
+    if nid:
+        return nid
+
     note = _find_by_title(identifier)
     return note["id"] if note else None
 
@@ -67,7 +141,10 @@ def create_note(
         "reminderDate": None,
         "category": category or "general"
     }
-    r = requests.post(BASE_URL, json=payload, timeout=30)
+    try:
+        r = requests.post(BASE_URL, json=payload, timeout=30)
+    finally:
+        _bump_generation()
     return safe_json(r)
 
 
@@ -87,7 +164,10 @@ def delete_note(identifier: str):
     if not nid:
         return {"error": f"No note found for '{identifier}'"}
 
-    r = requests.delete(f"{BASE_URL}/{nid}", timeout=30)
+    try:
+        r = requests.delete(f"{BASE_URL}/{nid}", timeout=30)
+    finally:
+        _bump_generation()
     return safe_json(r)
 
 
@@ -111,7 +191,11 @@ def update_note(identifier: str, fields: Dict[str, Any]):
     if not body:
         return {"error": "No valid fields provided to update."}
 
-    r = requests.patch(f"{BASE_URL}/{nid}", json=body, timeout=30)
+    try:
+        r = requests.patch(f"{BASE_URL}/{nid}", json=body, timeout=30)
+    finally:
+        if "title" in body:
+            _bump_generation()
     return safe_json(r)
 
 